@@ -13,12 +13,44 @@ Place next to: plugin.yaml, driver.py, optional .venv/, config.yaml/json, secret
 Run: python3 loader.py
 """
 
-import json, os, sys, time, importlib.util, inspect
+import functools, json, os, re, sys, time, importlib, inspect
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+# ---------- lazy module imports ----------
+_LAZY_MODULES: Dict[str, Any] = {}
+
+def _lazy(name: str):
+    """Import a module on first use and keep it (None when it is not installed)."""
+    try:
+        return _LAZY_MODULES[name]
+    except KeyError:
+        pass
+    try:
+        mod = importlib.import_module(name)
+    except ImportError:
+        mod = None
+    _LAZY_MODULES[name] = mod
+    return mod
 
 # ---------- walNUT's plugin manifest schema (subset) ----------
+_ID_RE = re.compile(r"^[a-z][a-z0-9]*(?:\.[a-z][a-z0-9]*)*$")
+_CAP_ID_RE = re.compile(r"^[a-z][a-z0-9_]*(?:\.[a-z][a-z0-9_]*)*$")
+_SEMVER_RE = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$")
+_ENTRYPOINT_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*:[a-zA-Z_][a-zA-Z0-9_]*$")
+_VERB_RE = re.compile(r"^[a-z][a-z0-9_]*$")
+
+# internal "format" names standing in for the schema's patterns, see _manifest_validator()
+_MANIFEST_FORMATS = {
+    "walnut-id": _ID_RE,
+    "walnut-capability-id": _CAP_ID_RE,
+    "walnut-semver": _SEMVER_RE,
+    "walnut-entrypoint": _ENTRYPOINT_RE,
+    "walnut-name": _VERB_RE,
+}
+_FORMAT_FOR_PATTERN = {rx.pattern: name for name, rx in _MANIFEST_FORMATS.items()}
+
 PLUGIN_MANIFEST_SCHEMA = {
     "$schema": "https://json-schema.org/draft/2020-12/schema",
     "type": "object",
@@ -27,7 +59,7 @@ PLUGIN_MANIFEST_SCHEMA = {
     "properties": {
         "id": {
             "type": "string",
-            "pattern": "^[a-z][a-z0-9]*(?:\\.[a-z][a-z0-9]*)*$"
+            "pattern": _ID_RE.pattern
         },
         "name": {
             "type": "string",
@@ -36,11 +68,11 @@ PLUGIN_MANIFEST_SCHEMA = {
         },
         "version": {
             "type": "string",
-            "pattern": "^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-((?:0|[1-9]\\d*|\\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\\.(?:0|[1-9]\\d*|\\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\\+([0-9a-zA-Z-]+(?:\\.[0-9a-zA-Z-]+)*))?$"
+            "pattern": _SEMVER_RE.pattern
         },
         "min_core_version": {
             "type": "string",
-            "pattern": "^(0|[1-9]\\d*)\\.(0|[1-9]\\d*)\\.(0|[1-9]\\d*)(?:-((?:0|[1-9]\\d*|\\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\\.(?:0|[1-9]\\d*|\\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\\+([0-9a-zA-Z-]+(?:\\.[0-9a-zA-Z-]+)*))?$"
+            "pattern": _SEMVER_RE.pattern
         },
         "category": {
             "type": "string",
@@ -52,7 +84,7 @@ PLUGIN_MANIFEST_SCHEMA = {
             "properties": {
                 "entrypoint": {
                     "type": "string",
-                    "pattern": "^[a-zA-Z_][a-zA-Z0-9_]*:[a-zA-Z_][a-zA-Z0-9_]*$"
+                    "pattern": _ENTRYPOINT_RE.pattern
                 }
             }
         },
@@ -74,17 +106,17 @@ PLUGIN_MANIFEST_SCHEMA = {
                 "properties": {
                     "id": {
                         "type": "string",
-                        "pattern": "^[a-z][a-z0-9_]*(?:\\.[a-z][a-z0-9_]*)*$"
+                        "pattern": _CAP_ID_RE.pattern
                     },
                     "verbs": {
                         "type": "array",
                         "minItems": 1,
-                        "items": {"type": "string", "pattern": "^[a-z][a-z0-9_]*$"}
+                        "items": {"type": "string", "pattern": _VERB_RE.pattern}
                     },
                     "targets": {
                         "type": "array", 
                         "minItems": 1,
-                        "items": {"type": "string", "pattern": "^[a-z][a-z0-9_]*$"}
+                        "items": {"type": "string", "pattern": _VERB_RE.pattern}
                     }
                 }
             }
@@ -93,48 +125,111 @@ PLUGIN_MANIFEST_SCHEMA = {
 }
 
 # ---------- minimal YAML/JSON loader ----------
+# C JSON parsers when installed; all of these accept bytes
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+if _orjson is not None:
+    _fast_json_loads = _orjson.loads
+else:
+    try:
+        from ujson import loads as _fast_json_loads
+    except ImportError:
+        _fast_json_loads = json.loads
+
+
+def _json_loads(data: bytes) -> Any:
+    try:
+        return _fast_json_loads(data)
+    except ValueError:
+        # stdlib json still accepts NaN/Infinity, which the C parsers reject
+        return json.loads(data)
+
+def _json_dumps(obj: Any) -> str:
+    """Indented JSON text for display, via orjson when installed.
+
+    Not for files: orjson writes NaN/Infinity as null and emits non-ASCII unescaped,
+    and default=str turns anything unencodable into a string.
+    """
+    if _orjson is not None:
+        try:
+            # passthrough keeps dataclasses/datetimes going through default=str, as with stdlib json
+            opts = (_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS
+                    | _orjson.OPT_PASSTHROUGH_DATACLASS | _orjson.OPT_PASSTHROUGH_DATETIME)
+            return _orjson.dumps(obj, option=opts, default=str).decode()
+        except TypeError:
+            pass  # orjson rejects some values stdlib json accepts, e.g. ints wider than 64 bits
+    return json.dumps(obj, indent=2, default=str)
+
+# every run parses plugin.yaml, so resolve PyYAML (optional) and its libyaml classes up front
+try:
+    import yaml as _yaml
+except ImportError:
+    _yaml = None
+else:
+    _YAML_LOADER = getattr(_yaml, "CSafeLoader", _yaml.SafeLoader)
+    _YAML_DUMPER = getattr(_yaml, "CSafeDumper", _yaml.SafeDumper)
+
 def _load_yaml_or_json(path: Path) -> dict:
-    if not path.exists(): return {}
-    if path.suffix.lower() == ".json":
-        return json.loads(path.read_text())
+    # open directly instead of stat-ing first; callers mostly know the file is there
     try:
-        import yaml  # optional
-        return yaml.safe_load(path.read_text()) or {}
-    except Exception:
-        # fallback: allow JSON-in-.yaml for zero-deps runs
-        return json.loads(path.read_text())
+        f = path.open("rb")
+    except FileNotFoundError:
+        return {}
+    with f:
+        if path.suffix.lower() == ".json" or _yaml is None:
+            # .json, or the fallback that allows JSON-in-.yaml for zero-deps runs
+            return _json_loads(f.read())
+        return _yaml.load(f, Loader=_YAML_LOADER) or {}  # the loader reads and decodes the stream itself
 
 def _save_yaml_or_json(path: Path, data: dict):
     if path.suffix.lower() == ".json":
         path.write_text(json.dumps(data, indent=2))
         return
-    try:
-        import yaml
-        path.write_text(yaml.safe_dump(data, sort_keys=False))
-    except Exception:
+    if _yaml is not None:
+        path.write_text(_yaml.dump(data, Dumper=_YAML_DUMPER, sort_keys=False))
+    else:
         path.write_text(json.dumps(data, indent=2))
 
 # ---------- walNUT-style schema validation ----------
-def validate_plugin_manifest(manifest_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate plugin.yaml using walNUT's exact schema validation logic."""
+def _with_formats(node: Any) -> Any:
+    """Copy of a schema node with each known "pattern" swapped for its precompiled format."""
+    if isinstance(node, list):
+        return [_with_formats(v) for v in node]
+    if not isinstance(node, dict):
+        return node
+    out = {k: _with_formats(v) for k, v in node.items()}
+    pattern = out.get("pattern")
+    if isinstance(pattern, str) and pattern in _FORMAT_FOR_PATTERN:
+        del out["pattern"]
+        out["format"] = _FORMAT_FOR_PATTERN[pattern]
+    return out
+
+@functools.lru_cache(maxsize=None)
+def _manifest_validator():
+    """Compile PLUGIN_MANIFEST_SCHEMA once; None when jsonschema is unavailable."""
     try:
-        from jsonschema import Draft202012Validator
-        validator = Draft202012Validator(PLUGIN_MANIFEST_SCHEMA)
-        errors = list(validator.iter_errors(manifest_data))
-        
-        if errors:
-            formatted_errors = []
-            for error in errors:
-                formatted_errors.append({
-                    "path": ".".join(str(p) for p in error.absolute_path),
-                    "message": error.message,
-                    "value": error.instance
-                })
-            return {"valid": False, "errors": formatted_errors}
-        
-        return {"valid": True, "errors": []}
-        
+        from jsonschema import Draft202012Validator, FormatChecker
     except ImportError:
+        return None
+    checker = FormatChecker(formats=())
+    for name, pattern in _MANIFEST_FORMATS.items():
+        # non-strings pass here; the "type" keyword reports them
+        checker.checks(name)(lambda v, _p=pattern: not isinstance(v, str) or _p.match(v) is not None)
+    Draft202012Validator.check_schema(PLUGIN_MANIFEST_SCHEMA)
+    return Draft202012Validator(_with_formats(PLUGIN_MANIFEST_SCHEMA), format_checker=checker)
+
+def _error_message(error) -> str:
+    if error.validator == "format" and error.validator_value in _MANIFEST_FORMATS:
+        # word it as the exported schema's "pattern" keyword would
+        return f"{error.instance!r} does not match {_MANIFEST_FORMATS[error.validator_value].pattern!r}"
+    return error.message
+
+def validate_plugin_manifest(manifest_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate plugin.yaml using walNUT's exact schema validation logic."""
+    validator = _manifest_validator()
+    if validator is None:
         return {
             "valid": False,
             "errors": [{
@@ -144,18 +239,28 @@ def validate_plugin_manifest(manifest_data: Dict[str, Any]) -> Dict[str, Any]:
             }]
         }
 
+    errors = list(validator.iter_errors(manifest_data))
+    if errors:
+        formatted_errors = []
+        for error in errors:
+            formatted_errors.append({
+                "path": ".".join(str(p) for p in error.absolute_path),
+                "message": _error_message(error),
+                "value": error.instance
+            })
+        return {"valid": False, "errors": formatted_errors}
+
+    return {"valid": True, "errors": []}
+
 # ---------- walNUT-style capability conformance validation ----------
 def validate_capability_conformance(capabilities: List[Dict[str, Any]], driver_methods: Set[str]) -> Dict[str, Any]:
     """Validate that driver methods match declared capabilities."""
-    errors = []
-    
-    for cap in capabilities:
-        cap_id = cap.get("id", "")
-        method_name = cap_id.replace(".", "_")
-        
-        if method_name not in driver_methods:
-            errors.append(f"Driver missing method '{method_name}' for capability '{cap_id}'")
-    
+    expected = {cap.get("id", "").replace(".", "_"): cap.get("id", "") for cap in capabilities}
+    if expected.keys() <= driver_methods:
+        return {"conformant": True, "errors": []}
+
+    errors = [f"Driver missing method '{method_name}' for capability '{cap_id}'"
+              for method_name, cap_id in expected.items() if method_name not in driver_methods]
     return {
         "conformant": len(errors) == 0,
         "errors": errors
@@ -164,8 +269,7 @@ def validate_capability_conformance(capabilities: List[Dict[str, Any]], driver_m
 # ---------- simple secret prompt ----------
 def prompt_secret(label: str) -> str:
     try:
-        import getpass  # stdlib, masks input
-        return getpass.getpass(f"{label}: ")
+        return _lazy("getpass").getpass(f"{label}: ")  # stdlib, masks input
     except Exception:
         # fallback if getpass console not available
         return input(f"{label}: ")
@@ -187,59 +291,37 @@ class Target:
     labels: Dict[str, Any] = field(default_factory=dict)
 
 # ---------- walNUT's plugin venv isolation system ----------
-def _candidate_site_packages(venv_dir: Path) -> List[Path]:
-    """Get candidate site-packages paths matching walNUT's logic."""
-    paths: List[Path] = []
+def _candidate_site_packages(venv_dir: Path) -> Iterator[Path]:
+    """Yield candidate site-packages paths matching walNUT's logic."""
     # Linux/macOS style: .venv/lib/pythonX.Y/site-packages or lib64
-    lib_dir = venv_dir / "lib"
-    if lib_dir.exists():
-        for child in lib_dir.iterdir():
-            if child.is_dir() and child.name.startswith("python"):
-                sp = child / "site-packages"
-                if sp.exists():
-                    paths.append(sp)
-        # lib64 variant
-        lib64_dir = venv_dir / "lib64"
-        if lib64_dir.exists():
-            for child in lib64_dir.iterdir():
-                if child.is_dir() and child.name.startswith("python"):
-                    sp = child / "site-packages"
-                    if sp.exists():
-                        paths.append(sp)
+    for root in (venv_dir / "lib", venv_dir / "lib64"):
+        try:
+            entries = os.scandir(root)
+        except OSError:
+            continue
+        with entries:
+            for de in entries:
+                if de.name.startswith("python") and de.is_dir():
+                    sp = os.path.join(de.path, "site-packages")
+                    if os.path.isdir(sp):
+                        yield Path(sp)
     # Windows style: .venv/Lib/site-packages
     win_sp = venv_dir / "Lib" / "site-packages"
-    if win_sp.exists():
-        paths.append(win_sp)
-    # Ensure uniqueness while preserving order
-    seen = set()
-    unique_paths: List[Path] = []
-    for p in paths:
-        if str(p) not in seen:
-            seen.add(str(p))
-            unique_paths.append(p)
-    return unique_paths
+    if win_sp.is_dir():
+        yield win_sp
 
 def get_plugin_site_packages(plugin_dir: Path) -> List[Path]:
     """Return a list of extra import paths for a plugin matching walNUT's logic."""
     paths: List[Path] = []
     venv_dir = plugin_dir / ".venv"
-    if venv_dir.exists() and venv_dir.is_dir():
+    if venv_dir.is_dir():
         paths.extend(_candidate_site_packages(venv_dir))
     # Fallback vendor directories (no venv)
-    vendor_dir = plugin_dir / "_vendor"
-    if vendor_dir.exists() and vendor_dir.is_dir():
-        paths.append(vendor_dir)
-    vendor_dir2 = plugin_dir / "vendor"
-    if vendor_dir2.exists() and vendor_dir2.is_dir():
-        paths.append(vendor_dir2)
-    # Ensure uniqueness
-    seen = set()
-    unique: List[Path] = []
-    for p in paths:
-        if str(p) not in seen:
-            seen.add(str(p))
-            unique.append(p)
-    return unique
+    for vendor_dir in (plugin_dir / "_vendor", plugin_dir / "vendor"):
+        if vendor_dir.is_dir():
+            paths.append(vendor_dir)
+    # Ensure uniqueness while preserving order
+    return [Path(p) for p in dict.fromkeys(str(x) for x in paths)]
 
 class PluginImportPath:
     """Context manager matching walNUT's plugin_import_path exactly."""
@@ -248,40 +330,60 @@ class PluginImportPath:
         self.removed = []
     
     def __enter__(self):
-        to_add = [str(p) for p in get_plugin_site_packages(self.plugin_dir)]
-        for p in reversed(to_add):  # keep original order when inserting at front
-            if p not in sys.path:
-                sys.path.insert(0, p)
-                self.removed.append(p)
+        present = set(sys.path)
+        to_add = [p for p in (str(x) for x in get_plugin_site_packages(self.plugin_dir)) if p not in present]
+        sys.path[:0] = to_add  # one front insertion, original order kept
+        self.removed = to_add
         return self
     
     def __exit__(self, *exc):
-        # Remove only what we added
-        for p in self.removed:
-            try:
-                if p in sys.path:
-                    sys.path.remove(p)
-            except Exception:
-                pass
+        # Remove only what we added, in a single pass over sys.path
+        if self.removed:
+            n = len(self.removed)
+            if sys.path[:n] == self.removed:
+                del sys.path[:n]  # untouched since __enter__: drop the prefix by index
+            else:
+                removed_set = set(self.removed)
+                sys.path[:] = [p for p in sys.path if p not in removed_set]
+            self.removed = []
 
 # ---------- driver load ----------
-def load_manifest(here: Path) -> dict:
+def _intern_manifest(m: dict) -> dict:
+    """Intern keys, capability ids, verbs and targets so menu comparisons hit the identity fast path."""
+    m = {sys.intern(k) if isinstance(k, str) else k: v for k, v in m.items()}
+    caps = m.get("capabilities")
+    for c in caps if isinstance(caps, list) else ():
+        if not isinstance(c, dict): continue
+        if isinstance(c.get("id"), str): c["id"] = sys.intern(c["id"])
+        for key in ("verbs", "targets"):
+            if isinstance(c.get(key), list):
+                c[key] = [sys.intern(v) if isinstance(v, str) else v for v in c[key]]
+    return m
+
+def _listed_or_exists(path: Path, files: Optional[Set[str]]) -> bool:
+    """path.exists(), skipping the stat when a directory listing already has the name."""
+    return (files is not None and path.name in files) or path.exists()
+
+def load_manifest(here: Path, files: Optional[Set[str]] = None) -> dict:
     mf = here / "plugin.yaml"
-    if not mf.exists(): raise RuntimeError("plugin.yaml not found")
+    if not _listed_or_exists(mf, files): raise RuntimeError("plugin.yaml not found")
     m = _load_yaml_or_json(mf)
     if not isinstance(m, dict): raise RuntimeError("plugin.yaml invalid")
-    return m
+    return _intern_manifest(m)
 
-def load_driver(here: Path, config: dict, secrets: dict):
-    m = load_manifest(here)
+def load_driver(here: Path, config: dict, secrets: dict, manifest: Optional[dict] = None,
+                files: Optional[Set[str]] = None):
+    m = load_manifest(here, files) if manifest is None else manifest
     entry = (m.get("driver") or {}).get("entrypoint") or "driver:Driver"
     mod_name, cls_name = entry.split(":", 1)
     drv_path = here / f"{mod_name}.py"
-    if not drv_path.exists(): raise RuntimeError(f"Driver file missing: {drv_path.name}")
-    with PluginVenvPath(here):
-        spec = importlib.util.spec_from_file_location("plugin_driver", drv_path)
+    if not _listed_or_exists(drv_path, files): raise RuntimeError(f"Driver file missing: {drv_path.name}")
+    util = _lazy("importlib.util")
+    with PluginImportPath(here):
+        spec = util.spec_from_file_location("plugin_driver", drv_path)
         if not spec or not spec.loader: raise RuntimeError("Failed to create import spec")
-        mod = importlib.util.module_from_spec(spec); spec.loader.exec_module(mod)
+        # SourceFileLoader already reuses/writes __pycache__ bytecode keyed on driver.py's mtime
+        mod = util.module_from_spec(spec); spec.loader.exec_module(mod)
         cls = getattr(mod, cls_name, None)
         if cls is None: raise RuntimeError(f"Class '{cls_name}' not found in {drv_path.name}")
         inst = IntegrationInstance(name=config.get("name","Test Instance"),
@@ -294,21 +396,97 @@ def load_driver(here: Path, config: dict, secrets: dict):
     return driver, m
 
 # ---------- capability helpers ----------
+_INV_LIST = sys.intern("inventory.list")
+# inventory types that can only be listed within a site
+_SITE_DEPENDENT_TYPES = frozenset({sys.intern("device"), sys.intern("port")})
+
 def list_caps(mf: dict) -> List[dict]:
-    caps = mf.get("capabilities") or []
+    caps = mf.get("capabilities")
+    if not isinstance(caps, list): return []
+    # entries that are not mappings are malformed; skip them rather than fail the whole menu
     return [{
         "id": c.get("id"),
         "verbs": c.get("verbs", []),
         "targets": c.get("targets", []),
         "dry_run": c.get("dry_run", "optional"),
-    } for c in caps]
+    } for c in caps if isinstance(c, dict)]
 
 def cap_method(cap_id: str) -> str:
     return cap_id.replace(".", "_")
 
+def action_call_args(sig: Optional[inspect.Signature], verb: str, target: Optional[Target],
+                     options: dict, dry_run: bool) -> Optional[tuple]:
+    """Pick the (args, kwargs) a capability method accepts, or None if it cannot take dry_run.
+
+    Tries the standard forms in order -- keyword (verb, target, options, dry_run),
+    positional (verb, target, options, dry_run), keyword (verb, target, dry_run),
+    positional (verb, target, dry_run) -- and keeps the first one the signature binds.
+    """
+    forms = [
+        ((), {"verb": verb, "target": target, "options": options, "dry_run": dry_run}),
+        ((verb, target, options, dry_run), {}),
+        ((), {"verb": verb, "target": target, "dry_run": dry_run}),
+        ((verb, target, dry_run), {}),
+    ]
+    if sig is None:
+        # no introspectable signature (e.g. C callables): use the full positional form
+        return forms[1]
+    for args, kwargs in forms:
+        try:
+            sig.bind(*args, **kwargs)
+        except TypeError:
+            continue
+        return args, kwargs
+    return None
+
+@dataclass
+class LoaderState:
+    """Menu data derived once from the parsed manifest for an interactive session."""
+    manifest: Dict[str, Any]
+    caps: List[dict] = field(default_factory=list)
+    inventory_targets: frozenset = frozenset()
+    action_caps: List[dict] = field(default_factory=list)
+    method_for_cap: Dict[str, str] = field(default_factory=dict)
+    driver: Any = None  # loaded on first use, see interactive_loop's get_driver()
+    driver_methods: Set[str] = field(default_factory=set)
+    cap_fns: Dict[str, Any] = field(default_factory=dict)  # cap id -> bound driver method, None if missing
+
+    @classmethod
+    def from_manifest(cls, manifest: dict) -> "LoaderState":
+        caps = list_caps(manifest)
+        return cls(manifest=manifest,
+                   caps=caps,
+                   inventory_targets=frozenset(t for c in caps if c["id"] == _INV_LIST and isinstance(c["targets"], list)
+                                             for t in c["targets"] if isinstance(t, str)),
+                   action_caps=[c for c in caps if c["id"] != _INV_LIST],
+                   # malformed ids stay listed but get no method; do_action reports them when picked
+                   method_for_cap={c["id"]: cap_method(c["id"]) for c in caps if isinstance(c["id"], str)})
+
+def driver_method_names(driver: Any) -> Set[str]:
+    """Public callables on driver, looked up statically so properties are not evaluated."""
+    names = set()
+    for n in dir(driver):
+        if n.startswith("_"): continue
+        attr = inspect.getattr_static(driver, n, None)
+        if callable(attr) or isinstance(attr, (classmethod, staticmethod)):
+            names.add(n)
+    return names
+
 # ---------- interactive UI ----------
+_YES = frozenset({"y", "yes", "1", "true"})
+_NO = frozenset({"n", "no", "0", "false"})
+
 def press_enter(): input("\n↩︎  Enter to continue...")
 
+def print_json(obj: Any):
+    if _orjson is not None:
+        sys.stdout.write(_json_dumps(obj))
+    else:
+        # stream straight to stdout rather than building the whole string first;
+        # an unencodable value can leave partial output behind before it raises
+        json.dump(obj, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
 def choose_idx(prompt: str, items: List[str], allow_back=True) -> Optional[int]:
     while True:
         print(f"\n{prompt}")
@@ -320,18 +498,21 @@ def choose_idx(prompt: str, items: List[str], allow_back=True) -> Optional[int]:
         print("Invalid selection. Try again.")
 
 def interactive_loop(here: Path):
+    # one directory listing instead of a stat per candidate file
+    with os.scandir(here) as it:
+        files = {e.name for e in it if e.is_file()}
+
     # load or prompt config/secrets
     cfg = {}
     for n in ("config.yaml","config.json"):
-        p = here / n
-        if p.exists(): cfg = _load_yaml_or_json(p); break
+        if n in files: cfg = _load_yaml_or_json(here / n); break
     sec = {}
     for n in ("secrets.yaml","secrets.json"):
-        p = here / n
-        if p.exists(): sec = _load_yaml_or_json(p); break
+        if n in files: sec = _load_yaml_or_json(here / n); break
 
     # check schema for required/optional fields with prompts
-    manifest = load_manifest(here)
+    state = LoaderState.from_manifest(load_manifest(here, files))
+    manifest = state.manifest
     schema = manifest.get("schema", {}).get("connection", {})
     properties = schema.get("properties", {})
     required_fields = schema.get("required", [])
@@ -354,58 +535,68 @@ def interactive_loop(here: Path):
             default_str = " [Y/n]" if default is True else " [y/N]" if default is False else " [y/n]"
             response = input(f"{title}{default_str}: ").strip().lower()
             
-            if response in ("y", "yes", "1", "true"):
+            if response in _YES:
                 cfg[field] = True
-            elif response in ("n", "no", "0", "false"):
+            elif response in _NO:
                 cfg[field] = False
             elif response == "" and default is not None:
                 cfg[field] = default
 
     # lazy driver import so we can edit config first if needed
-    try:
-        driver, manifest = load_driver(here, cfg, sec)
-    except Exception as e:
-        print(f"\n[load] {e}")
-        return
+    def get_driver():
+        if state.driver is None:
+            try:
+                state.driver, _ = load_driver(here, cfg, sec, manifest, files)
+            except Exception as e:
+                print(f"\n[load] {e}")
+                return None
+            state.driver_methods = driver_method_names(state.driver)
+            state.cap_fns = {cid: getattr(state.driver, m, None) if m in state.driver_methods else None
+                             for cid, m in state.method_for_cap.items()}
+            # surface coverage gaps once, not only when an action is picked
+            for err in validate_capability_conformance(
+                    [c for c in state.caps if isinstance(c["id"], str)], state.driver_methods)["errors"]:
+                print(f"[conformance] {err}")
+        return state.driver
+
+    sig_cache: Dict[str, Optional[inspect.Signature]] = {}
 
     def do_probe():
         print("\n▶ Probe / test_connection")
-        t0 = time.time()
+        driver = get_driver()
+        if driver is None: return
+        t0 = time.perf_counter_ns()
         try:
-            res = driver.test_connection() if hasattr(driver,"test_connection") else {}
-            ms = int((time.time()-t0)*1000)
+            res = driver.test_connection() if "test_connection" in state.driver_methods else {}
+            elapsed_ns = time.perf_counter_ns()-t0
             status = res.get("status","unknown")
-            latency = res.get("latency_ms", ms)
-            print(f"status={status} latency_ms={latency} msg={res.get('message','')}")
+            if "latency_ms" in res: latency = f"latency_ms={res['latency_ms']}"
+            elif elapsed_ns < 1_000_000: latency = f"latency_us={elapsed_ns//1_000}"  # sub-ms local probes
+            else: latency = f"latency_ms={elapsed_ns//1_000_000}"
+            print(f"status={status} {latency} msg={res.get('message','')}")
         except Exception as e:
             print(f"Probe error: {e}")
 
     def do_caps():
-        caps = list_caps(manifest)
-        print(f"\nCapabilities ({len(caps)}):")
-        for c in caps:
+        print(f"\nCapabilities ({len(state.caps)}):")
+        for c in state.caps:
             print(f"  • {c['id']}  verbs={c['verbs']} targets={c['targets']} dry_run={c['dry_run']}")
 
     def do_inventory():
-        caps = list_caps(manifest)
-        inv_targets = set()
-        for c in caps:
-            if c["id"] == "inventory.list":
-                for t in c.get("targets", []): inv_targets.add(t)
-        if not inv_targets:
+        if not state.inventory_targets:
             print("\nNo inventory targets exposed.")
             return
-        choices = sorted(inv_targets)
+        driver = get_driver()
+        if driver is None: return
+        choices = sorted(state.inventory_targets)
         idx = choose_idx("Select inventory type", choices)
         if idx is None: return
         inv_type = choices[idx]
-        active = input("Active-only? [Y/n]: ").strip().lower() not in ("n","no","0")
+        active = input("Active-only? [Y/n]: ").strip().lower() not in _NO
         
         # Smart site_id handling for UX improvement
         options = None
-        site_dependent_types = {"device", "port"}
-        
-        if inv_type in site_dependent_types:
+        if inv_type in _SITE_DEPENDENT_TYPES:
             print(f"\n{inv_type.title()} listing requires a site. Let me get available sites first...")
             try:
                 sites = driver.inventory_list("site", active_only=True, options=None) or []
@@ -439,7 +630,7 @@ def interactive_loop(here: Path):
             except Exception as e:
                 print(f"Invalid JSON: {e}"); return
         
-        if not hasattr(driver,"inventory_list"):
+        if "inventory_list" not in state.driver_methods:
             print("Driver lacks inventory_list()"); return
         try:
             items = driver.inventory_list(inv_type, active_only=active, options=options) or []
@@ -454,13 +645,18 @@ def interactive_loop(here: Path):
             print(f"Inventory error: {e}")
 
     def do_action():
-        caps = [c for c in list_caps(manifest) if c["id"] != "inventory.list"]
-        if not caps:
+        if not state.action_caps:
             print("\nNo actionable capabilities."); return
-        labels = [f"{c['id']}  (verbs={c['verbs']}, targets={c['targets']})" for c in caps]
+        if get_driver() is None: return
+        labels = [f"{c['id']}  (verbs={c['verbs']}, targets={c['targets']})" for c in state.action_caps]
         idx = choose_idx("Select capability", labels)
         if idx is None: return
-        cap = caps[idx]
+        cap = state.action_caps[idx]
+        if not isinstance(cap["id"], str):
+            print(f"Capability has no valid id: {cap['id']!r}"); return
+        fn = state.cap_fns.get(cap["id"])
+        if fn is None:
+            print(f"Driver missing method {state.method_for_cap[cap['id']]}"); return
         verb_choices = cap.get("verbs", [])
         if not verb_choices:
             print("This capability defines no verbs."); return
@@ -478,40 +674,36 @@ def interactive_loop(here: Path):
             tgt_type = possible_targets[ti]
             tgt_id = input(f"Enter target external_id for {tgt_type} (or blank to skip): ").strip() or None
 
-        dry = input("Dry-run? [Y/n]: ").strip().lower() not in ("n","no","0")
+        dry = input("Dry-run? [Y/n]: ").strip().lower() not in _NO
         opts_txt = input("Options JSON (or blank): ").strip()
         try:
             options = json.loads(opts_txt) if opts_txt else {}
         except Exception as e:
             print(f"Invalid JSON: {e}"); return
 
-        method_name = cap_method(cap["id"])
-        if not hasattr(driver, method_name):
-            print(f"Driver missing method {method_name}"); return
-        fn = getattr(driver, method_name)
-
         target = Target(type=tgt_type, external_id=str(tgt_id)) if (tgt_type and tgt_id) else None
-        # Try common signatures
-        attempts = [
-            lambda: fn(verb=verb, target=target, options=options, dry_run=dry),
-            lambda: fn(verb, target, options, dry),
-            lambda: fn(verb=verb, target=target, dry_run=dry),
-            lambda: fn(verb, target, dry),
-        ]
-        err = None
-        for call in attempts:
+        if cap["id"] not in sig_cache:
             try:
-                res = call() or {"success": True}
-                print(json.dumps(res, indent=2, default=str)); return
-            except TypeError as te:
-                err = te; continue
-            except Exception as e:
-                print(f"Action error: {e}"); return
-        print(f"Could not call with standard signatures: {err}")
+                sig_cache[cap["id"]] = inspect.signature(fn)
+            except (ValueError, TypeError):
+                sig_cache[cap["id"]] = None
+        call = action_call_args(sig_cache[cap["id"]], verb, target, options, dry)
+        if call is None:
+            print(f"Could not call {state.method_for_cap[cap['id']]}{sig_cache[cap['id']]} with standard signatures "
+                  "(verb, target[, options], dry_run)"); return
+        args, kwargs = call
+        try:
+            res = fn(*args, **kwargs) or {"success": True}
+        except Exception as e:
+            print(f"Action error: {e}"); return
+        try:
+            print_json(res)
+        except Exception as e:
+            print(f"\nCould not encode action result as JSON: {e}")
 
     def do_config():
         print("\nCurrent config:")
-        print(json.dumps(cfg, indent=2))
+        print_json(cfg)
         print("\n1) Edit hostname  2) Edit username  3) Edit password  4) Save config.yaml  0) Back")
         ch = input("> ").strip()
         if ch == "1": cfg["hostname"] = input("hostname: ").strip()
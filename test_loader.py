@@ -0,0 +1,131 @@
+import functools
+import inspect
+import math
+import unittest
+
+from loader import (
+    PLUGIN_MANIFEST_SCHEMA, LoaderState, Target, _json_loads, action_call_args, validate_plugin_manifest,
+)
+
+try:
+    from jsonschema import Draft202012Validator
+except ImportError:
+    Draft202012Validator = None
+
+
+class ActionCallArgsTest(unittest.TestCase):
+    target = Target(type="port", external_id="p1")
+
+    def call_args(self, fn):
+        return action_call_args(inspect.signature(fn), "start", self.target, {"a": 1}, True)
+
+    def test_keyword_four_arg_form(self):
+        def fn(verb, target, options, dry_run): pass
+        self.assertEqual(self.call_args(fn),
+                         ((), {"verb": "start", "target": self.target, "options": {"a": 1}, "dry_run": True}))
+
+    def test_keyword_three_arg_form(self):
+        def fn(verb, target, dry_run): pass
+        self.assertEqual(self.call_args(fn), ((), {"verb": "start", "target": self.target, "dry_run": True}))
+
+    def test_var_keyword_gets_every_value(self):
+        def fn(**kwargs): pass
+        self.assertEqual(self.call_args(fn),
+                         ((), {"verb": "start", "target": self.target, "options": {"a": 1}, "dry_run": True}))
+
+    def test_differently_named_dry_flag_is_passed_positionally(self):
+        def fn(verb, target, options=None, dry=False): pass
+        self.assertEqual(self.call_args(fn), (("start", self.target, {"a": 1}, True), {}))
+
+    def test_differently_named_options_is_passed_positionally(self):
+        def fn(verb, target, opts, dry): pass
+        self.assertEqual(self.call_args(fn), (("start", self.target, {"a": 1}, True), {}))
+
+    def test_positional_three_arg_form(self):
+        def fn(v, t, d): pass
+        self.assertEqual(self.call_args(fn), (("start", self.target, True), {}))
+
+    def test_positional_only_verb(self):
+        def fn(verb, /, target, dry_run): pass
+        self.assertEqual(self.call_args(fn), (("start", self.target, True), {}))
+
+    def test_method_without_dry_run_is_refused(self):
+        def fn(verb, target): pass
+        self.assertIsNone(self.call_args(fn))
+
+    def test_nameless_callables_are_bound_like_functions(self):
+        def impl(driver, verb, target, dry_run): pass
+        def impl_without_dry_run(driver, verb, target): pass
+        class Callable:
+            def __call__(self, verb, target, dry_run): pass
+        for fn in (functools.partial(impl, object()), Callable()):
+            self.assertFalse(hasattr(fn, "__name__"))
+            self.assertEqual(self.call_args(fn), ((), {"verb": "start", "target": self.target, "dry_run": True}))
+        self.assertIsNone(self.call_args(functools.partial(impl_without_dry_run, object())))
+
+    def test_unintrospectable_callable_uses_positional_form(self):
+        self.assertEqual(action_call_args(None, "start", None, {}, False), (("start", None, {}, False), {}))
+
+
+class LoaderStateTest(unittest.TestCase):
+    def test_malformed_capability_entries_are_skipped(self):
+        state = LoaderState.from_manifest({"capabilities": [
+            "just-a-string",
+            {"id": "inventory.list", "verbs": ["read"], "targets": ["site", ["unhashable"]]},
+            {"id": "inventory.list", "verbs": ["read"], "targets": "device"},
+            {"id": "power.control", "verbs": ["start"], "targets": ["port"]},
+            {"verbs": ["x"], "targets": ["port"]},
+        ]})
+        self.assertEqual([c["id"] for c in state.caps], ["inventory.list", "inventory.list", "power.control", None])
+        self.assertEqual(state.inventory_targets, frozenset({"site"}))
+        self.assertEqual(state.method_for_cap, {"inventory.list": "inventory_list", "power.control": "power_control"})
+
+    def test_inventory_targets_are_unioned(self):
+        state = LoaderState.from_manifest({"capabilities": [
+            {"id": "inventory.list", "verbs": ["read"], "targets": ["site"]},
+            {"id": "inventory.list", "verbs": ["read"], "targets": ["device"]},
+        ]})
+        self.assertEqual(state.inventory_targets, frozenset({"site", "device"}))
+
+    def test_non_list_capabilities(self):
+        self.assertEqual(LoaderState.from_manifest({"capabilities": "oops"}).caps, [])
+
+
+class JsonLoadsTest(unittest.TestCase):
+    def test_plain_document(self):
+        self.assertEqual(_json_loads(b'{"a": [1, "x"]}'), {"a": [1, "x"]})
+
+    def test_nan_and_infinity_are_accepted(self):
+        data = _json_loads(b'{"a": NaN, "b": Infinity}')
+        self.assertTrue(math.isnan(data["a"]))
+        self.assertEqual(data["b"], float("inf"))
+
+    def test_invalid_json_still_raises(self):
+        with self.assertRaises(ValueError):
+            _json_loads(b"{oops")
+
+
+@unittest.skipIf(Draft202012Validator is None, "jsonschema not installed")
+class ValidatePluginManifestTest(unittest.TestCase):
+    manifest = {
+        "id": "test.plugin", "name": "Test", "version": "1.0.0", "min_core_version": "0.1.0",
+        "category": "monitoring", "driver": {"entrypoint": "driver:Driver"},
+        "schema": {"connection": {"type": "object"}},
+        "capabilities": [{"id": "power.control", "verbs": ["start"], "targets": ["port"]}],
+    }
+
+    def test_valid_manifest(self):
+        self.assertEqual(validate_plugin_manifest(self.manifest), {"valid": True, "errors": []})
+
+    def test_pattern_errors_match_the_exported_schema(self):
+        bad = dict(self.manifest, id="Bad", version="1.0",
+                   capabilities=[{"id": "power.control", "verbs": ["Start", 3], "targets": ["port"]}])
+        expected = [(".".join(str(p) for p in e.absolute_path), e.message)
+                    for e in Draft202012Validator(PLUGIN_MANIFEST_SCHEMA).iter_errors(bad)]
+        result = validate_plugin_manifest(bad)
+        self.assertFalse(result["valid"])
+        self.assertEqual(sorted((e["path"], e["message"]) for e in result["errors"]), sorted(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()